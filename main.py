@@ -1,4 +1,6 @@
 # main.py
+import argparse
+
 from src.analysis import build_meal_plan_table, evaluate_solution
 from src.data_cleaning import clean_data
 from src.data_loader import load_data
@@ -23,6 +25,14 @@ def ask_float(prompt: str, default: float) -> float:
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Daily meal plan optimizer")
+    parser.add_argument(
+        "--no-plots",
+        action="store_true",
+        help="Skip generating plots (faster when only CSV outputs are needed)",
+    )
+    args = parser.parse_args()
+
     root = project_root()
     results_dir = root / "results"
     ensure_dir(results_dir)
@@ -45,9 +55,12 @@ def main() -> None:
     df = load_data()
 
     # Pre-optimization visualizations
-    print("Step 3: Pre-optimization visualizations")
-    plot_macro_histograms(df)
-    plot_calories_vs_protein(df)
+    if args.no_plots:
+        print("Step 3: Skipping pre-optimization visualizations (--no-plots)")
+    else:
+        print("Step 3: Pre-optimization visualizations")
+        plot_macro_histograms(df)
+        plot_calories_vs_protein(df)
 
     # Build model
     print("Step 4: Building optimization model")
@@ -68,27 +81,32 @@ def main() -> None:
     if status != "Optimal":
         print("Warning: Solution status is not Optimal. You may want to relax constraints.")
 
+    # Index the dataset by item once; the extraction and analysis
+    # steps below all reuse it instead of rebuilding the hash index.
+    df_by_item = df.set_index("Food_Item")
+
     # Extract solution (servings → grams)
     print("Step 6: Extracting solution")
-    solution_df = extract_solution(df, items, s)
+    solution_df = extract_solution(df, items, s, df_by_item=df_by_item)
     solution_path = results_dir / "optimal_solution.csv"
     solution_df.to_csv(solution_path, index=False)
     print(f"Optimal solution saved to {solution_path}")
 
     # Build meal-wise plan table
     print("Step 7: Building meal-wise plan table")
-    plan_df = build_meal_plan_table(df, solution_df)
+    plan_df = build_meal_plan_table(df, solution_df, df_by_item=df_by_item)
     plan_path = results_dir / "solution_explanation.csv"
     plan_df.to_csv(plan_path, index=False)
     print(f"Meal-wise plan saved to {plan_path}")
 
     # Evaluate totals vs targets
     print("Step 8: Evaluating totals vs targets")
-    metrics = evaluate_solution(df, solution_df, cal_target, protein_target, fat_target, carb_target)
+    metrics = evaluate_solution(
+        df, solution_df, cal_target, protein_target, fat_target, carb_target,
+        df_by_item=df_by_item,
+    )
     metrics_path = results_dir / "metrics.txt"
-    with open(metrics_path, "w") as f:
-        for k, v in metrics.items():
-            f.write(f"{k}: {v}\n")
+    metrics_path.write_text("\n".join(f"{k}: {v}" for k, v in metrics.items()) + "\n")
     print(f"Metrics saved to {metrics_path}")
 
     print("\nSummary Metrics")
@@ -96,8 +114,11 @@ def main() -> None:
         print(f"{k}: {v}")
 
     # Post-optimization visualization
-    print("Step 9: Plotting optimal solution")
-    plot_optimal_solution(solution_df)
+    if args.no_plots:
+        print("Step 9: Skipping optimal solution plot (--no-plots)")
+    else:
+        print("Step 9: Plotting optimal solution")
+        plot_optimal_solution(solution_df)
 
     print("\nPipeline completed successfully.")
     print("Check the 'results/' folder for CSVs, metrics, and plots.")
@@ -1,35 +1,69 @@
 # src/analysis.py
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 
-def compute_totals(df: pd.DataFrame, solution_df: pd.DataFrame) -> Dict[str, float]:
+def _select_items(
+    df: pd.DataFrame,
+    solution_df: pd.DataFrame,
+    df_by_item: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Pull the df rows for the solution's items via an indexed lookup.
+
+    A merge against the full DataFrame hashes all N rows even though the
+    solution only selects k << N items; indexing probes exactly k rows.
+    Callers running several analysis passes can build
+    df.set_index("Food_Item") once and pass it as df_by_item.
+    """
+    if df_by_item is None:
+        df_by_item = df.set_index("Food_Item")
+    sub = df_by_item.loc[solution_df["Food_Item"]].reset_index()
+    # Items appearing under several meal types fan out to multiple rows,
+    # so align solution columns by item rather than by position. Collapse
+    # any duplicate solution rows first: .map requires a unique index.
+    sol = solution_df.set_index("Food_Item")
+    if not sol.index.is_unique:
+        sol = sol.groupby(level=0, sort=False).sum()
+    for col in ["Servings", "Quantity (grams)"]:
+        if col in sol.columns:
+            sub[col] = sub["Food_Item"].map(sol[col])
+    return sub
+
+
+def compute_totals(
+    df: pd.DataFrame,
+    solution_df: pd.DataFrame,
+    df_by_item: Optional[pd.DataFrame] = None,
+) -> Dict[str, float]:
     """
     Compute total nutrients for the optimal solution.
 
     Nutrient columns in df are per serving.
     We multiply per-serving values by the number of servings.
     """
-    merged = solution_df.merge(df, on="Food_Item", how="left")
-
-    def total(col: str) -> float:
-        if col not in merged.columns:
-            return 0.0
-        return float((merged[col] * merged["Servings"]).sum())
-
-    totals = {
-        "Total Calories (kcal)": total("Calories (kcal)"),
-        "Total Protein (g)": total("Protein (g)"),
-        "Total Fat (g)": total("Fat (g)"),
-        "Total Carbohydrates (g)": total("Carbohydrates (g)"),
-        "Total Sugars (g)": total("Sugars (g)"),
-        "Total Fiber (g)": total("Fiber (g)"),
-        "Total Sodium (mg)": total("Sodium (mg)"),
+    merged = _select_items(df, solution_df, df_by_item)
+
+    labels = {
+        "Total Calories (kcal)": "Calories (kcal)",
+        "Total Protein (g)": "Protein (g)",
+        "Total Fat (g)": "Fat (g)",
+        "Total Carbohydrates (g)": "Carbohydrates (g)",
+        "Total Sugars (g)": "Sugars (g)",
+        "Total Fiber (g)": "Fiber (g)",
+        "Total Sodium (mg)": "Sodium (mg)",
     }
 
-    return totals
+    # One matrix-vector product instead of a separate pass per column.
+    present = [c for c in labels.values() if c in merged.columns]
+    nutrients = merged[present].to_numpy(dtype=np.float64)
+    servings = merged["Servings"].to_numpy(dtype=np.float64)
+    by_column = dict(zip(present, nutrients.T @ servings))
+
+    return {label: float(by_column.get(col, 0.0)) for label, col in labels.items()}
 
 
 def evaluate_solution(
@@ -39,11 +73,12 @@ def evaluate_solution(
     protein_target: float,
     fat_target: float,
     carb_target: float,
+    df_by_item: Optional[pd.DataFrame] = None,
 ) -> Dict[str, Any]:
     """
     Compare solution totals vs user targets.
     """
-    totals = compute_totals(df, solution_df)
+    totals = compute_totals(df, solution_df, df_by_item)
     metrics: Dict[str, Any] = {}
     metrics.update(totals)
 
@@ -56,21 +91,25 @@ def evaluate_solution(
     return metrics
 
 
-def build_meal_plan_table(df: pd.DataFrame, solution_df: pd.DataFrame) -> pd.DataFrame:
+def build_meal_plan_table(
+    df: pd.DataFrame,
+    solution_df: pd.DataFrame,
+    df_by_item: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
     """
     Build a detailed table grouped by Meal_Type showing the final plan in grams.
     """
-    merged = solution_df.merge(df, on="Food_Item", how="left")
+    merged = _select_items(df, solution_df, df_by_item)
 
-    merged["Calories Contribution (kcal)"] = (
-        merged["Calories (kcal)"] * merged["Servings"]
-    )
-    merged["Protein Contribution (g)"] = (
-        merged["Protein (g)"] * merged["Servings"]
-    )
-    merged["Carb Contribution (g)"] = (
-        merged["Carbohydrates (g)"] * merged["Servings"]
+    # One broadcast multiply for all three contribution columns.
+    contrib = (
+        merged[["Calories (kcal)", "Protein (g)", "Carbohydrates (g)"]]
+        .to_numpy(dtype=np.float64)
+        * merged["Servings"].to_numpy(dtype=np.float64)[:, None]
     )
+    merged["Calories Contribution (kcal)"] = contrib[:, 0]
+    merged["Protein Contribution (g)"] = contrib[:, 1]
+    merged["Carb Contribution (g)"] = contrib[:, 2]
 
     cols = [
         "Meal_Type",
@@ -23,9 +23,24 @@ REQUIRED_COLUMNS = [
 ]
 
 
+def read_csv_fast(path: Path) -> pd.DataFrame:
+    """
+    Read a CSV with the multithreaded pyarrow engine, which parses in
+    parallel and infers numeric dtypes at parse time. Falls back to the
+    default C engine (skipping malformed lines) when pyarrow is missing
+    or refuses the file.
+    """
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError):
+        return pd.read_csv(path, on_bad_lines="skip")
+
+
 def clean_data(
     raw_path: Optional[Path] = None,
     output_path: Optional[Path] = None,
+    write_back: bool = True,
+    df: Optional[pd.DataFrame] = None,
 ) -> pd.DataFrame:
     """
     Load the raw dataset, perform basic cleaning, and save a cleaned version.
@@ -33,20 +48,22 @@ def clean_data(
     Assumptions:
     - Nutrient values (calories, protein, etc.) are given per serving,
       where each serving has weight 'Estimated_Serving_Weight_g'.
-    """
-    ensure_dir(DATA_DIR)
-
-    raw_path = raw_path or RAW_DATA_PATH
-    output_path = output_path or CLEAN_DATA_PATH
 
-    if not raw_path.exists():
-        raise FileNotFoundError(
-            f"Raw data file not found at {raw_path}. "
-            f"Please place your dataset there as 'original_csv.csv'."
-        )
-
-    # Some lines might be malformed; skip them
-    df = pd.read_csv(raw_path, on_bad_lines="skip")
+    Pass df to clean an already-loaded DataFrame without touching disk
+    (the input frame is not modified). Set write_back=False to skip
+    saving the cleaned CSV (useful when the caller caches the returned
+    DataFrame and does not need the file).
+    """
+    if df is None:
+        raw_path = raw_path or RAW_DATA_PATH
+        if not raw_path.exists():
+            raise FileNotFoundError(
+                f"Raw data file not found at {raw_path}. "
+                f"Please place your dataset there as 'original_csv.csv'."
+            )
+        df = read_csv_fast(raw_path)
+    else:
+        df = df.copy()
 
     missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
     if missing:
@@ -64,7 +81,10 @@ def clean_data(
         ]
     ]
     for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+        # pyarrow usually parses these as numeric already; only coerce
+        # columns the parser left as strings/objects.
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
 
     # Drop rows with missing critical values
     df = df.dropna(
@@ -79,15 +99,21 @@ def clean_data(
         ]
     )
 
-    # Normalize strings
+    # Normalize strings. Category/Meal_Type are low-cardinality, so
+    # title-case only the unique values and map them back instead of
+    # running the string kernel over every cell.
     df["Food_Item"] = df["Food_Item"].astype(str).str.strip()
-    df["Category"] = df["Category"].astype(str).str.strip().str.title()
-    df["Meal_Type"] = df["Meal_Type"].astype(str).str.strip().str.title()
+    for col in ["Category", "Meal_Type"]:
+        stripped = df[col].astype(str).str.strip()
+        df[col] = stripped.map({u: u.title() for u in pd.unique(stripped)})
 
     # Remove duplicates (Food_Item + Meal_Type)
     df = df.drop_duplicates(subset=["Food_Item", "Meal_Type"]).reset_index(drop=True)
 
-    df.to_csv(output_path, index=False)
-    print(f"[data_cleaning] Cleaned dataset saved to {output_path}")
+    if write_back:
+        output_path = output_path or CLEAN_DATA_PATH
+        ensure_dir(output_path.parent)
+        df.to_csv(output_path, index=False)
+        print(f"[data_cleaning] Cleaned dataset saved to {output_path}")
 
     return df
@@ -5,7 +5,7 @@ from typing import Optional
 
 import pandas as pd
 
-from .data_cleaning import CLEAN_DATA_PATH, clean_data
+from .data_cleaning import CLEAN_DATA_PATH, clean_data, read_csv_fast
 
 
 def load_data(path: Optional[Path] = None) -> pd.DataFrame:
@@ -18,6 +18,6 @@ def load_data(path: Optional[Path] = None) -> pd.DataFrame:
         print("[data_loader] Cleaned data not found. Running data_cleaning...")
         clean_data()
 
-    df = pd.read_csv(path)
+    df = read_csv_fast(path)
     print(f"[data_loader] Loaded cleaned dataset from {path}. Rows = {len(df)}")
     return df
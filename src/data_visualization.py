@@ -3,7 +3,7 @@
 from pathlib import Path
 from typing import Optional
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 from .utils import ensure_dir, project_root
@@ -12,13 +12,31 @@ RESULTS_DIR = project_root() / "results"
 PLOTS_DIR = RESULTS_DIR / "plots"
 
 
-def plot_macro_histograms(df: pd.DataFrame, output_path: Optional[Path] = None) -> None:
+def _pyplot():
     """
-    Plot histograms for calories and macronutrients across all foods.
+    Import pyplot lazily with the headless Agg backend, so callers that
+    skip plotting never pay the matplotlib import + GUI setup cost.
     """
-    ensure_dir(PLOTS_DIR)
-    output_path = output_path or (PLOTS_DIR / "macro_histograms.png")
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
 
+
+def plot_macro_histograms(
+    df: pd.DataFrame,
+    output_path: Optional[Path] = None,
+    save: bool = True,
+):
+    """
+    Plot histograms for calories and macronutrients across all foods.
+
+    Returns the Figure (or None if no macro columns exist) so callers
+    like the Streamlit app can render it directly without a PNG round
+    trip; set save=False to skip writing the file.
+    """
     macro_cols = [
         "Calories (kcal)",
         "Protein (g)",
@@ -31,54 +49,96 @@ def plot_macro_histograms(df: pd.DataFrame, output_path: Optional[Path] = None)
 
     if not existing:
         print("[data_visualization] No macro columns found to plot.")
-        return
-
-    df[existing].hist(bins=20, figsize=(12, 8))
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
-    print(f"[data_visualization] Macro histograms saved to {output_path}")
-
-
-def plot_calories_vs_protein(df: pd.DataFrame, output_path: Optional[Path] = None) -> None:
+        return None
+
+    plt = _pyplot()
+
+    # Bin with np.histogram and draw 20 bars per panel, so matplotlib
+    # never touches the raw data points.
+    ncols = 3
+    nrows = int(np.ceil(len(existing) / ncols))
+    fig, axes = plt.subplots(nrows, ncols, figsize=(12, 8))
+    axes = np.atleast_1d(axes).ravel()
+
+    for ax, col in zip(axes, existing):
+        values = df[col].to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        counts, edges = np.histogram(values, bins=20)
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge")
+        ax.set_title(col)
+
+    for ax in axes[len(existing):]:
+        ax.set_visible(False)
+
+    fig.tight_layout()
+    if save:
+        ensure_dir(PLOTS_DIR)
+        output_path = output_path or (PLOTS_DIR / "macro_histograms.png")
+        fig.savefig(output_path)
+        print(f"[data_visualization] Macro histograms saved to {output_path}")
+    plt.close(fig)
+    return fig
+
+
+def plot_calories_vs_protein(
+    df: pd.DataFrame,
+    output_path: Optional[Path] = None,
+    save: bool = True,
+):
     """
     Scatter plot of calories vs protein to show nutrient density per serving.
-    """
-    ensure_dir(PLOTS_DIR)
-    output_path = output_path or (PLOTS_DIR / "calories_vs_protein.png")
 
+    Returns the Figure (or None if the columns are missing); set
+    save=False to skip writing the file.
+    """
     if "Calories (kcal)" not in df.columns or "Protein (g)" not in df.columns:
         print("[data_visualization] Required columns for scatter plot not found.")
-        return
-
-    plt.figure()
-    plt.scatter(df["Calories (kcal)"], df["Protein (g)"])
-    plt.xlabel("Calories (kcal) per serving")
-    plt.ylabel("Protein (g) per serving")
-    plt.title("Calories vs Protein per Serving")
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
-    print(f"[data_visualization] Calories vs Protein plot saved to {output_path}")
-
-
-def plot_optimal_solution(solution_df: pd.DataFrame, output_path: Optional[Path] = None) -> None:
+        return None
+
+    plt = _pyplot()
+    fig, ax = plt.subplots()
+    ax.scatter(df["Calories (kcal)"], df["Protein (g)"])
+    ax.set_xlabel("Calories (kcal) per serving")
+    ax.set_ylabel("Protein (g) per serving")
+    ax.set_title("Calories vs Protein per Serving")
+    fig.tight_layout()
+    if save:
+        ensure_dir(PLOTS_DIR)
+        output_path = output_path or (PLOTS_DIR / "calories_vs_protein.png")
+        fig.savefig(output_path)
+        print(f"[data_visualization] Calories vs Protein plot saved to {output_path}")
+    plt.close(fig)
+    return fig
+
+
+def plot_optimal_solution(
+    solution_df: pd.DataFrame,
+    output_path: Optional[Path] = None,
+    save: bool = True,
+):
     """
     Bar plot of quantity (grams) for each selected item in the optimal plan.
-    """
-    ensure_dir(PLOTS_DIR)
-    output_path = output_path or (PLOTS_DIR / "optimal_solution_bar.png")
 
+    Saved as SVG by default: with many rotated item labels, vector
+    output avoids the text rasterization cost of PNG rendering.
+    Returns the Figure (or None for an empty solution); set save=False
+    to skip writing the file.
+    """
     if solution_df.empty:
         print("[data_visualization] Solution is empty; no plot generated.")
-        return
-
-    plt.figure(figsize=(12, 6))
-    plt.bar(solution_df["Food_Item"], solution_df["Quantity (grams)"])
-    plt.xticks(rotation=90)
-    plt.ylabel("Quantity (grams)")
-    plt.title("Optimal Day Plan - Items (in grams)")
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
-    print(f"[data_visualization] Optimal solution bar plot saved to {output_path}")
+        return None
+
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.bar(solution_df["Food_Item"], solution_df["Quantity (grams)"])
+    ax.tick_params(axis="x", rotation=90)
+    ax.set_ylabel("Quantity (grams)")
+    ax.set_title("Optimal Day Plan - Items (in grams)")
+    fig.tight_layout()
+    if save:
+        ensure_dir(PLOTS_DIR)
+        output_path = output_path or (PLOTS_DIR / "optimal_solution_bar.svg")
+        fig.savefig(output_path)
+        print(f"[data_visualization] Optimal solution bar plot saved to {output_path}")
+    plt.close(fig)
+    return fig
@@ -1,7 +1,8 @@
 # src/model.py
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import List, Tuple
+import numpy as np
 import pandas as pd
 import pulp
 import re
@@ -10,19 +11,23 @@ import re
 # ------------------------------------------------------
 # Helper: sanitize + add unique ID to guarantee no collisions
 # ------------------------------------------------------
+_SAFE_RE = re.compile(r'[^A-Za-z0-9_]+')
+
+
 def safe_name(name: str, idx: int) -> str:
     """
     Replace characters unsafe for PuLP AND append the row index
     to ensure constraint names are always unique.
     """
-    base = re.sub(r'[^A-Za-z0-9_]+', '_', name)
-    return f"{base}_{idx}"
+    return f"{_SAFE_RE.sub('_', name)}_{idx}"
 
 
 # ------------------------------------------------------
 # User target + model config
 # ------------------------------------------------------
-@dataclass
+# Frozen so instances are hashable and can key caches (st.cache_*).
+# No slots=True: that needs Python 3.10+ and the README supports 3.9.
+@dataclass(frozen=True)
 class NutritionTargets:
     cal_target: float
     protein_target: float
@@ -43,35 +48,51 @@ class NutritionTargets:
 def build_diet_model(
     df: pd.DataFrame,
     targets: NutritionTargets,
-) -> Tuple[pulp.LpProblem, Dict[str, pulp.LpVariable], Dict[str, pulp.LpVariable], List[str]]:
+) -> Tuple[pulp.LpProblem, List[pulp.LpVariable], List[pulp.LpVariable], List[str]]:
 
     # List of food items
     items = df["Food_Item"].tolist()
 
-    meal_types = ["Breakfast", "Lunch", "Dinner", "Snack"]
-
-    # Group items by meal
-    meal_to_items = {
-        meal: df[df["Meal_Type"] == meal]["Food_Item"].tolist()
-        for meal in meal_types
-    }
+    # Row positions per meal type, straight off the group index --
+    # no per-meal scan, and the constraints below index y_list by
+    # position instead of hashing item names.
+    meal_indices = df.groupby("Meal_Type", sort=False).indices
 
     # Initialize model
     model = pulp.LpProblem("Daily_Meal_Optimization", pulp.LpMinimize)
 
-    # Variables
-    s = pulp.LpVariable.dicts("servings", items, lowBound=0, cat="Continuous")
-    y = pulp.LpVariable.dicts("select", items, lowBound=0, upBound=1, cat="Binary")
+    # Variables, kept in lists indexed by row position so the hot
+    # constraint loops below avoid hashing food-name strings. Giving
+    # each serving variable its native upper bound lets the solver's
+    # presolve treat it as a variable bound instead of deriving it
+    # from the MaxServings rows.
+    smin = targets.min_servings_per_item
+    smax = targets.max_servings_per_item
+
+    s_list = [
+        pulp.LpVariable(
+            f"servings_{i}",
+            lowBound=0,
+            upBound=smax,
+            cat="Continuous",
+        )
+        for i in range(len(items))
+    ]
+    y_list = [
+        pulp.LpVariable(f"select_{i}", lowBound=0, upBound=1, cat="Binary")
+        for i in range(len(items))
+    ]
 
     # Slack variables for calories deviation
     s_plus = pulp.LpVariable("calorie_plus", lowBound=0)
     s_minus = pulp.LpVariable("calorie_minus", lowBound=0)
 
     # Objective function
-    # Minimize |calorie deviation| + tiny penalty on total servings
-    model += (
-        s_plus + s_minus +
-        0.001 * pulp.lpSum(s[item] for item in items)
+    # Minimize |calorie deviation| + tiny penalty on total servings.
+    # The penalty coefficient goes straight into the expression, so
+    # PuLP never re-walks an N-term sum to scale it.
+    model += pulp.LpAffineExpression(
+        [(s_plus, 1.0), (s_minus, 1.0)] + [(v, 0.001) for v in s_list]
     ), "Objective"
 
     # ------------------------------------------------------
@@ -82,13 +103,13 @@ def build_diet_model(
 
         # max servings per item (if selected)
         model += (
-            s[item] <= targets.max_servings_per_item * y[item],
+            s_list[idx] <= smax * y_list[idx],
             f"MaxServings_{cname}"
         )
 
         # min servings per item (if selected)
         model += (
-            s[item] >= targets.min_servings_per_item * y[item],
+            s_list[idx] >= smin * y_list[idx],
             f"MinServings_{cname}"
         )
 
@@ -96,7 +117,8 @@ def build_diet_model(
     # Limit total number of dishes across the full day
     # ------------------------------------------------------
     model += (
-        pulp.lpSum(y[i] for i in items) <= targets.max_total_dishes,
+        pulp.LpAffineExpression([(v, 1.0) for v in y_list])
+        <= targets.max_total_dishes,
         "Max_Total_Dishes"
     )
 
@@ -106,71 +128,72 @@ def build_diet_model(
     # Snack: exactly 1 item
     # ------------------------------------------------------
     for meal in ["Breakfast", "Lunch", "Dinner"]:
-        meal_items = meal_to_items.get(meal, [])
-        if len(meal_items) >= 2:
+        meal_rows = meal_indices.get(meal, [])
+        if len(meal_rows) >= 2:
+            meal_count = pulp.LpAffineExpression([(y_list[i], 1.0) for i in meal_rows])
             # at least 2 items
-            model += (
-                pulp.lpSum(y[i] for i in meal_items) >= 2,
-                f"MinItems_{meal}"
-            )
+            model += (meal_count >= 2, f"MinItems_{meal}")
             # at most 3 items
-            model += (
-                pulp.lpSum(y[i] for i in meal_items) <= 3,
-                f"MaxItems_{meal}"
-            )
+            model += (meal_count <= 3, f"MaxItems_{meal}")
 
     # Snack: exactly 1 item (if there are snack items)
-    snack_items = meal_to_items.get("Snack", [])
-    if len(snack_items) >= 1:
+    snack_rows = meal_indices.get("Snack", [])
+    if len(snack_rows) >= 1:
         model += (
-            pulp.lpSum(y[i] for i in snack_items) == 1,
+            pulp.LpAffineExpression([(y_list[i], 1.0) for i in snack_rows]) == 1,
             "ExactItems_Snack"
         )
 
     # ------------------------------------------------------
-    # Access nutrient value by row index
-    # Nutrients are per *serving* as given in dataset.
+    # Pull the nutrient columns once as a single contiguous
+    # float32 block (one row per nutrient), halving the memory
+    # touched while building constraints. float32 is plenty of
+    # precision for kcal/gram values. Nutrients are per *serving*
+    # as given in dataset; per-row df.loc access would pay a
+    # pandas label lookup per cell.
     # ------------------------------------------------------
-    def v(idx: int, col: str) -> float:
-        return float(df.loc[idx, col])
+    nutrients = np.ascontiguousarray(
+        df[["Calories (kcal)", "Protein (g)", "Fat (g)", "Carbohydrates (g)"]]
+        .to_numpy(dtype=np.float32)
+        .T
+    )
+    cal, prot, fat, carb = nutrients
 
     # ------------------------------------------------------
     # Global nutrition constraints
     # Total = sum( nutrient_per_serving * servings )
     # ------------------------------------------------------
 
+    # Build each expression in a single pass via LpAffineExpression
+    # instead of lpSum, which merges N intermediate expressions.
+
     # Calories
     model += (
-        pulp.lpSum(
-            v(i, "Calories (kcal)") * s[df.loc[i, "Food_Item"]]
-            for i in df.index
-        )
+        pulp.LpAffineExpression([(v, float(c)) for v, c in zip(s_list, cal)])
         == targets.cal_target + s_plus - s_minus
     ), "Calorie_Balance"
 
     # Protein >=
     model += (
-        pulp.lpSum(
-            v(i, "Protein (g)") * s[df.loc[i, "Food_Item"]]
-            for i in df.index
-        ) >= targets.protein_target
+        pulp.LpAffineExpression([(v, float(p)) for v, p in zip(s_list, prot)])
+        >= targets.protein_target
     ), "Protein_Min"
 
     # Fat <=
     model += (
-        pulp.lpSum(
-            v(i, "Fat (g)") * s[df.loc[i, "Food_Item"]]
-            for i in df.index
-        ) <= targets.fat_target
+        pulp.LpAffineExpression([(v, float(f)) for v, f in zip(s_list, fat)])
+        <= targets.fat_target
     ), "Fat_Max"
 
     # Carbs <=
     model += (
-        pulp.lpSum(
-            v(i, "Carbohydrates (g)") * s[df.loc[i, "Food_Item"]]
-            for i in df.index
-        ) <= targets.carb_target
+        pulp.LpAffineExpression([(v, float(c)) for v, c in zip(s_list, carb)])
+        <= targets.carb_target
     ), "Carb_Max"
 
+    # The variable lists are returned positionally (aligned with items)
+    # rather than as name-keyed dicts: items listed under several meal
+    # types share a name but have one variable per row, and a dict would
+    # silently drop all but the last.
     print("[model] Model built successfully with SAFE + UNIQUE constraint names and meal-wise item limits.")
-    return model, s, y, items
+    return model, s_list, y_list, items
@@ -0,0 +1,93 @@
+# src/model_fast.py
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from .model import NutritionTargets
+
+
+def build_and_solve_lp(
+    df: pd.DataFrame,
+    targets: NutritionTargets,
+    threshold: float = 1e-4,
+) -> Tuple[str, pd.DataFrame]:
+    """
+    Solve the continuous relaxation of the diet problem directly with
+    scipy's HiGHS backend, bypassing PuLP entirely.
+
+    The model keeps the nutrition constraints and per-serving bounds but
+    drops the binary selection variables (and with them the meal-variety
+    and dish-count constraints), leaving a pure LP over the servings
+    vector plus the two calorie slack variables. Assembling the arrays
+    here avoids PuLP's expression graph and LP-file writer, which are
+    pure Python overhead for a model this small.
+
+    Returns (status, solution_df) with solution_df in the same format
+    as solver.extract_solution.
+    """
+    from scipy.optimize import linprog
+
+    n = len(df)
+    cal = df["Calories (kcal)"].to_numpy(dtype=np.float64)
+    prot = df["Protein (g)"].to_numpy(dtype=np.float64)
+    fat = df["Fat (g)"].to_numpy(dtype=np.float64)
+    carb = df["Carbohydrates (g)"].to_numpy(dtype=np.float64)
+
+    # Variable layout: [servings_0..servings_{n-1}, s_plus, s_minus].
+    # Objective matches the PuLP model: |calorie deviation| plus a tiny
+    # penalty on total servings.
+    c = np.concatenate([np.full(n, 0.001), [1.0, 1.0]])
+
+    # Calories: cal . x - s_plus + s_minus == cal_target
+    a_eq = np.concatenate([cal, [-1.0, 1.0]])[None, :]
+    b_eq = np.array([targets.cal_target])
+
+    # Fat <=, Carbs <=, Protein >= (negated into <= form)
+    slack_zeros = np.zeros(2)
+    a_ub = np.vstack(
+        [
+            np.concatenate([fat, slack_zeros]),
+            np.concatenate([carb, slack_zeros]),
+            np.concatenate([-prot, slack_zeros]),
+        ]
+    )
+    b_ub = np.array(
+        [targets.fat_target, targets.carb_target, -targets.protein_target]
+    )
+
+    bounds = [(0.0, targets.max_servings_per_item)] * n + [(0.0, None)] * 2
+
+    result = linprog(
+        c,
+        A_ub=a_ub,
+        b_ub=b_ub,
+        A_eq=a_eq,
+        b_eq=b_eq,
+        bounds=bounds,
+        method="highs",
+    )
+
+    status = {0: "Optimal", 2: "Infeasible", 3: "Unbounded"}.get(
+        result.status, "Not Solved"
+    )
+
+    if result.x is None:
+        empty = pd.DataFrame(columns=["Food_Item", "Servings", "Quantity (grams)"])
+        print(f"[model_fast] LP status: {status}")
+        return status, empty
+
+    servings = result.x[:n]
+    weights = df["Estimated_Serving_Weight_g"].to_numpy(dtype=np.float64)
+    mask = servings > threshold
+
+    solution_df = pd.DataFrame(
+        {
+            "Food_Item": df["Food_Item"].to_numpy()[mask],
+            "Servings": servings[mask],
+            "Quantity (grams)": (servings * weights)[mask],
+        }
+    )
+    print(f"[model_fast] LP status: {status}; non-zero items: {len(solution_df)}")
+    return status, solution_df
@@ -1,43 +1,223 @@
 # src/solver.py
 
-from typing import Dict, List
+import os
+from typing import List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 import pulp
 
 
-def solve_model(model: pulp.LpProblem) -> str:
+def _is_pure_lp(model: pulp.LpProblem) -> bool:
+    """True if the model has no integer/binary variables."""
+    return all(v.cat == pulp.LpContinuous for v in model.variables())
+
+
+def _solve_with_linprog(model: pulp.LpProblem) -> Optional[str]:
     """
-    Solve the given PuLP model using CBC solver.
-    Returns the solver status string.
+    Solve a pure LP in-process with scipy's HiGHS backend, avoiding the
+    CBC subprocess + LP-file round trip. Writes values back onto the
+    PuLP variables. Returns the status string, or None if scipy is not
+    available (caller falls back to CBC).
+    """
+    try:
+        from scipy.optimize import linprog
+    except ImportError:
+        return None
+
+    variables = model.variables()
+    index = {v.name: j for j, v in enumerate(variables)}
+    n = len(variables)
+
+    c = np.zeros(n)
+    for var, coef in model.objective.items():
+        c[index[var.name]] = coef
+
+    a_ub, b_ub, a_eq, b_eq = [], [], [], []
+    for constraint in model.constraints.values():
+        row = np.zeros(n)
+        for var, coef in constraint.items():
+            row[index[var.name]] = coef
+        # PuLP stores constraints as (expr + constant) <sense> 0
+        rhs = -constraint.constant
+        if constraint.sense == pulp.LpConstraintEQ:
+            a_eq.append(row)
+            b_eq.append(rhs)
+        elif constraint.sense == pulp.LpConstraintLE:
+            a_ub.append(row)
+            b_ub.append(rhs)
+        else:  # >= becomes <= after negation
+            a_ub.append(-row)
+            b_ub.append(-rhs)
+
+    result = linprog(
+        c,
+        A_ub=np.array(a_ub) if a_ub else None,
+        b_ub=np.array(b_ub) if b_ub else None,
+        A_eq=np.array(a_eq) if a_eq else None,
+        b_eq=np.array(b_eq) if b_eq else None,
+        bounds=[(v.lowBound, v.upBound) for v in variables],
+        method="highs",
+    )
+
+    if result.status == 0:
+        for var, value in zip(variables, result.x):
+            var.varValue = float(value)
+        model.assignStatus(pulp.LpStatusOptimal)
+    elif result.status == 2:
+        model.assignStatus(pulp.LpStatusInfeasible)
+    elif result.status == 3:
+        model.assignStatus(pulp.LpStatusUnbounded)
+    else:
+        model.assignStatus(pulp.LpStatusNotSolved)
+
+    return pulp.LpStatus[model.status]
+
+
+def _default_milp_solver(
+    time_limit: Optional[float] = 30,
+    gap_rel: Optional[float] = 0.01,
+) -> pulp.LpSolver:
+    """
+    Prefer the in-process HiGHS solver (needs the optional highspy
+    package); fall back to the bundled CBC subprocess otherwise.
+    HiGHS avoids the per-solve process spawn and is typically faster
+    than CBC on small-to-medium MILPs. When CBC is used, run its
+    branch-and-bound on all cores instead of the single-threaded
+    default.
+    """
+    try:
+        solver = pulp.HiGHS(msg=False, timeLimit=time_limit, gapRel=gap_rel)
+        if solver.available():
+            return solver
+    except Exception:
+        pass
+    return pulp.PULP_CBC_CMD(
+        msg=False, timeLimit=time_limit, gapRel=gap_rel, threads=os.cpu_count()
+    )
+
+
+def make_solver(
+    name: str,
+    time_limit: Optional[float] = 30,
+    gap_rel: Optional[float] = 0.01,
+) -> pulp.LpSolver:
     """
-    solver = pulp.PULP_CBC_CMD(msg=False)
+    Map a backend name ("HiGHS", "CBC" or "GLPK") to a configured PuLP
+    solver, falling back to CBC when the requested backend is not
+    installed. The time limit keeps pathological instances from hanging
+    callers; the relative gap lets the solver stop at near-optimal
+    (visually indistinguishable) plans instead of proving optimality.
+    Licensed Gurobi users can bypass this and pass pulp.GUROBI_CMD
+    directly to solve_model.
+    """
+    name = (name or "CBC").upper()
+    if name == "HIGHS":
+        try:
+            solver = pulp.HiGHS(msg=False, timeLimit=time_limit, gapRel=gap_rel)
+            if solver.available():
+                return solver
+        except Exception:
+            pass
+    elif name == "GLPK":
+        solver = pulp.GLPK_CMD(
+            msg=False,
+            options=["--tmlim", str(int(time_limit)), "--mipgap", str(gap_rel)],
+        )
+        if solver.available():
+            return solver
+    return pulp.PULP_CBC_CMD(
+        msg=False, timeLimit=time_limit, gapRel=gap_rel, threads=os.cpu_count()
+    )
+
+
+def solve_model(
+    model: pulp.LpProblem,
+    solver: Optional[pulp.LpSolver] = None,
+    time_limit: Optional[float] = 30,
+    gap_rel: Optional[float] = 0.01,
+) -> str:
+    """
+    Solve the given PuLP model and return the solver status string.
+
+    Pure LPs (no binaries active) take an in-process HiGHS fast path
+    via scipy; MILPs go through HiGHS when available, else CBC, bounded
+    by time_limit seconds and a gap_rel relative MIP gap so pathological
+    targets cannot hang callers. Pass an explicit `solver` to override.
+    """
+    if solver is None and _is_pure_lp(model):
+        status = _solve_with_linprog(model)
+        if status is not None:
+            print(f"[solver] Solver status: {status} (linprog fast path)")
+            return status
+
+    if solver is None:
+        solver = _default_milp_solver(time_limit, gap_rel)
     model.solve(solver)
     status = pulp.LpStatus[model.status]
     print(f"[solver] Solver status: {status}")
     return status
 
 
+def solve_for_targets(df: pd.DataFrame, targets) -> tuple:
+    """
+    Build, solve and extract a solution for one set of targets.
+
+    Self-contained so it can run in a worker process for parameter
+    sweeps (each solver invocation occupies one core).
+    Returns (status, solution_df).
+    """
+    from .model import build_diet_model
+
+    model, s, y, items = build_diet_model(df, targets)
+    status = solve_model(model)
+    solution_df = extract_solution(df, items, s)
+    return status, solution_df
+
+
 def extract_solution(
     df: pd.DataFrame,
     items: List[str],
-    s: Dict[str, pulp.LpVariable],
+    s: Sequence[pulp.LpVariable],
     threshold: float = 1e-4,
+    df_by_item: Optional[pd.DataFrame] = None,
 ) -> pd.DataFrame:
     """
     Extract the optimal quantities for items with servings > threshold.
     Converts servings → grams using Estimated_Serving_Weight_g per item.
+
+    `s` is the serving-variable list from build_diet_model, positionally
+    aligned with `items`; items listed under several meal types have one
+    variable per row and get their servings summed into a single output
+    row. Pass df.set_index("Food_Item") as df_by_item to reuse an index
+    that the caller already built for the analysis steps.
     """
-    rows = []
-    weight_map = df.set_index("Food_Item")["Estimated_Serving_Weight_g"].to_dict()
+    if df_by_item is None:
+        df_by_item = df.set_index("Food_Item")
+    weight_map = df_by_item["Estimated_Serving_Weight_g"].to_dict()
 
-    for item in items:
-        servings = s[item].value()
-        if servings is not None and servings > threshold:
-            w = weight_map.get(item, 100.0)  # fallback if missing
-            grams = servings * w
-            rows.append([item, servings, grams])
+    servings = np.fromiter(
+        (var.value() or 0.0 for var in s),
+        dtype=np.float64,
+        count=len(items),
+    )
+    weights = np.fromiter(
+        (weight_map.get(item, 100.0) for item in items),  # fallback if missing
+        dtype=np.float64,
+        count=len(items),
+    )
 
-    solution_df = pd.DataFrame(rows, columns=["Food_Item", "Servings", "Quantity (grams)"])
+    mask = servings > threshold
+    solution_df = pd.DataFrame(
+        {
+            "Food_Item": np.asarray(items, dtype=object)[mask],
+            "Servings": servings[mask],
+            "Quantity (grams)": (servings * weights)[mask],
+        }
+    )
+    if solution_df["Food_Item"].duplicated().any():
+        solution_df = solution_df.groupby(
+            "Food_Item", as_index=False, sort=False
+        ).sum()
     print(f"[solver] Non-zero items in solution: {len(solution_df)}")
     return solution_df
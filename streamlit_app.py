@@ -3,6 +3,7 @@
 Streamlit app for the Calorie Optimizer  optimization pipeline.
 """
 
+import hashlib
 import sys
 from pathlib import Path
 import streamlit as st
@@ -13,17 +14,12 @@ PROJECT_ROOT = Path(__file__).resolve().parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
-# Import project modules
+# Import only what the always-executed part of the script needs.
+# PuLP, matplotlib and the model/solver/analysis modules are imported
+# lazily inside the run blocks: Streamlit reruns this whole module on
+# every widget change, and most reruns never touch the solver.
 from src.data_cleaning import clean_data, CLEAN_DATA_PATH, RAW_DATA_PATH
 from src.data_loader import load_data
-from src.data_visualization import (
-    plot_macro_histograms,
-    plot_calories_vs_protein,
-    plot_optimal_solution,
-)
-from src.model import NutritionTargets, build_diet_model
-from src.solver import solve_model, extract_solution
-from src.analysis import build_meal_plan_table, evaluate_solution
 from src.utils import ensure_dir
 
 RESULTS_DIR = PROJECT_ROOT / "results"
@@ -49,134 +45,436 @@ st.sidebar.markdown("### Model Parameters")
 min_serv = st.sidebar.number_input("Min servings per item", value=0.5)
 max_serv = st.sidebar.number_input("Max servings per item", value=3.0)
 max_total_dishes = st.sidebar.number_input("Max distinct dishes", value=15)
+solver_name = st.sidebar.selectbox("Solver", ["HiGHS", "CBC", "GLPK"])
+time_limit = st.sidebar.slider("Solver time limit (s)", 5, 120, 30)
+gap_rel = st.sidebar.slider(
+    "Relative MIP gap", 0.0, 0.05, 0.01, step=0.005,
+    help="0.0 proves optimality; small gaps solve faster.",
+)
 
 st.sidebar.markdown("---")
 uploaded = st.sidebar.file_uploader("Upload custom dataset (.csv)", type=["csv"])
 force_clean = st.sidebar.checkbox("Force data cleaning")
+save_results = st.sidebar.checkbox("Persist outputs to /results", value=False)
 
 run = st.sidebar.button("Run Optimization")
 
+st.sidebar.markdown("---")
+st.sidebar.markdown("### Calorie Sweep")
+sweep_steps = st.sidebar.number_input(
+    "Extra targets each side of base", value=1, min_value=0, max_value=5, step=1
+)
+sweep_step_size = st.sidebar.number_input("Sweep step size (kcal)", value=100.0)
+run_sweep = st.sidebar.button("Run Calorie Sweep")
+
 # ---------------------------------------------
 # Dataset Loading
 # ---------------------------------------------
 st.title("Calorie Optimizer  — Optimization Engine")
 
+
+@st.cache_resource
+def _build_and_solve(
+    df_hash: str,
+    targets: "NutritionTargets",
+    solver_name: str,
+    time_limit: float,
+    gap_rel: float,
+    _prev_solution: dict,
+    _df: pd.DataFrame,
+):
+    """
+    Build and solve the model once per (dataset, targets) pair.
+
+    The DataFrame and the previous-solution hint are underscore-
+    prefixed so Streamlit keys the cache on the precomputed df_hash and
+    targets only; the PuLP model object itself is not picklable, hence
+    cache_resource. This runs on a worker thread, so it must not touch
+    st.session_state or emit UI elements.
+    """
+    import pulp
+
+    from src.model import build_diet_model
+    from src.solver import make_solver, solve_model
+
+    model, s_vars, y_vars, items = build_diet_model(_df, targets)
+
+    # Warm-start CBC from the previous solve, so small target tweaks
+    # reuse the last incumbent instead of starting branch-and-bound
+    # from scratch. Only attempted when the variable names line up
+    # exactly (same dataset/model shape); a previous value that
+    # violates the new bounds aborts the warm start.
+    model_vars = model.variables()
+    warm = bool(_prev_solution) and set(_prev_solution) == {
+        v.name for v in model_vars
+    }
+    if warm:
+        try:
+            for var in model_vars:
+                if _prev_solution[var.name] is not None:
+                    var.setInitialValue(_prev_solution[var.name])
+        except ValueError:
+            warm = False
+
+    # Warm starts are wired up for CBC only; other backends just solve.
+    if warm and solver_name == "CBC":
+        solver = pulp.PULP_CBC_CMD(
+            msg=False, warmStart=True, timeLimit=time_limit, gapRel=gap_rel
+        )
+    else:
+        solver = make_solver(solver_name, time_limit, gap_rel)
+    status = solve_model(model, solver=solver)
+    solution_values = {v.name: v.value() for v in model.variables()}
+    return model, s_vars, y_vars, items, status, solution_values
+
+
+@st.fragment
+def _render_solution(solution_df: pd.DataFrame) -> None:
+    """
+    Fragment: interacting with the widgets inside (e.g. the download
+    button) reruns only this block, not the solve pipeline above it.
+    """
+    st.dataframe(solution_df)
+    st.download_button(
+        "Download solution CSV",
+        solution_df.to_csv(index=False),
+        file_name="optimal_solution.csv",
+        mime="text/csv",
+    )
+
+
+@st.fragment
+def _render_plan(plan_df: pd.DataFrame) -> None:
+    """Fragment for the meal-plan table; same isolated rerun scope."""
+    st.dataframe(plan_df, height=400)  # fixed height -> client-side virtualized rows
+    st.download_button(
+        "Download meal plan CSV",
+        plan_df.to_csv(index=False),
+        file_name="solution_explanation.csv",
+        mime="text/csv",
+    )
+
+
+@st.cache_data
+def _preview(df_hash: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Arrow-backed head slice for the dataset preview, cached per dataset
+    so reruns skip both the conversion and Streamlit's serializer work.
+    """
+    try:
+        return _df.head(15).convert_dtypes(dtype_backend="pyarrow")
+    except (ImportError, TypeError):
+        return _df.head(15)
+
+
+@st.cache_data
+def _solution_bar_svg(solution_items: tuple) -> str:
+    """
+    Render the optimal-solution bar chart to an in-memory SVG, cached
+    on the (item, grams) pairs so identical solutions are not re-drawn.
+    """
+    import io
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    names = [item for item, _ in solution_items]
+    grams = [g for _, g in solution_items]
+
+    plt.figure(figsize=(12, 6))
+    plt.bar(names, grams)
+    plt.xticks(rotation=90)
+    plt.ylabel("Quantity (grams)")
+    plt.title("Optimal Day Plan - Items (in grams)")
+    plt.tight_layout()
+
+    buf = io.StringIO()
+    plt.savefig(buf, format="svg")
+    plt.close()
+    return buf.getvalue()
+
+
+def _with_hash(df: pd.DataFrame):
+    """
+    Pair a DataFrame with a cheap stable digest of its contents.
+    blake2b over the pandas row hashes is faster than sha1 and lets
+    every cache below key on the string instead of re-hashing the
+    frame on each rerun.
+    """
+    digest = hashlib.blake2b(
+        pd.util.hash_pandas_object(df, index=True).values.tobytes(),
+        digest_size=16,
+    ).hexdigest()
+    return df, digest
+
+
+# Dataset loading is memoized so widget interactions do not re-parse
+# and re-clean the CSV on every script rerun. The uploaded branch is
+# keyed on the file's bytes, the default branch on the cleaning flag;
+# the content hash is computed once alongside the load and cached with
+# it.
+@st.cache_data
+def _load_default(force_clean: bool):
+    if force_clean or not CLEAN_DATA_PATH.exists():
+        return _with_hash(clean_data())
+    return _with_hash(load_data())
+
+
+@st.cache_data
+def _load_uploaded(file_bytes: bytes):
+    import io
+
+    # The pyarrow engine parses the upload in parallel; fall back to
+    # the C engine (skipping malformed lines) if it refuses the file.
+    try:
+        df_uploaded = pd.read_csv(io.BytesIO(file_bytes), engine="pyarrow")
+    except (ImportError, ValueError):
+        df_uploaded = pd.read_csv(io.BytesIO(file_bytes), on_bad_lines="skip")
+    return _with_hash(clean_data(df=df_uploaded, write_back=False))
+
+
 if uploaded:
     st.success("Custom CSV uploaded.")
-    df_uploaded = pd.read_csv(uploaded, on_bad_lines="skip")
-    temp_raw = PROJECT_ROOT / "data" / "uploaded_raw.csv"
-    ensure_dir(temp_raw.parent)
-    df_uploaded.to_csv(temp_raw, index=False)
-    df_clean = clean_data(raw_path=temp_raw, output_path=PROJECT_ROOT / "data" / "uploaded_cleaned.csv")
-    df = df_clean
+    df, df_hash = _load_uploaded(uploaded.getvalue())
 else:
-    if force_clean or not CLEAN_DATA_PATH.exists():
+    if force_clean:
         st.info("Cleaning project dataset...")
-        df = clean_data()
-    else:
-        df = load_data()
+    df, df_hash = _load_default(force_clean)
+
+st.session_state["df_hash"] = df_hash
 
 st.markdown("### Preview of Dataset")
-st.dataframe(df.head(15))
+st.dataframe(_preview(df_hash, df), use_container_width=True)
 
 # ---------------------------------------------
 # RUN PIPELINE
+# The solve runs on a background thread so the UI stays responsive;
+# the script polls the future and reruns until it completes. CBC/HiGHS
+# run as external code that releases the GIL, so the thread gives real
+# concurrency.
 # ---------------------------------------------
 if run:
-    with st.spinner("Running optimization..."):
-        # -------------------------------------
-        # Pre-Optimization Plots (using your functions)
-        # -------------------------------------
-        st.markdown("## Pre-Optimization Visualizations")
-        plot_macro_histograms(df)               # saves to results/plots/
-        plot_calories_vs_protein(df)            # saves to results/plots/
-
-        st.success("Plots saved to /results/plots/. You can view them directly in the folder.")
-
-        st.markdown("### Preview of Saved Plots")
-
-        # Display saved macro histogram
-        macro_path = PLOTS_DIR / "macro_histograms.png"
-        if macro_path.exists():
-            st.image(str(macro_path), caption="Macro Histograms")
-
-        # Display saved calories vs protein scatter
-        scatter_path = PLOTS_DIR / "calories_vs_protein.png"
-        if scatter_path.exists():
-            st.image(str(scatter_path), caption="Calories vs Protein")
-
-
-        # -------------------------------------
-        # Build & Solve Model
-        # -------------------------------------
-        st.markdown("## Optimization Model")
-
-        targets = NutritionTargets(
-            cal_target=cal_target,
-            protein_target=protein_target,
-            carb_target=carb_target,
-            fat_target=fat_target,
-            min_servings_per_item=min_serv,
-            max_servings_per_item=max_serv,
-            max_total_dishes=max_total_dishes,
-        )
-
-        model, s_vars, y_vars, items = build_diet_model(df, targets)
-        st.info("Model built successfully.")
-
-        status = solve_model(model)
-        st.write(f"Solver Status: **{status}**")
-
-        if status != "Optimal":
-            st.warning("The solution is not optimal. Consider relaxing constraints.")
-
-        # -------------------------------------
-        # Extract Solution
-        # -------------------------------------
-        solution_df = extract_solution(df, items, s_vars)
-        solution_path = RESULTS_DIR / "optimal_solution.csv"
-        solution_df.to_csv(solution_path, index=False)
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.model import NutritionTargets
+
+    targets = NutritionTargets(
+        cal_target=cal_target,
+        protein_target=protein_target,
+        carb_target=carb_target,
+        fat_target=fat_target,
+        min_servings_per_item=min_serv,
+        max_servings_per_item=max_serv,
+        max_total_dishes=max_total_dishes,
+    )
+
+    # Drop items that would already bust a hard cap at their minimum
+    # serving: they can never appear in a feasible basket, and every
+    # removed row is one less (s, y) variable pair in the MILP. The
+    # calorie target is deliberately excluded — it is a soft equality
+    # with penalized slacks, so calorie-dense items remain legal picks.
+    feasible = (
+        (df["Fat (g)"] * min_serv <= fat_target)
+        & (df["Carbohydrates (g)"] * min_serv <= carb_target)
+    )
+    df_model = df.loc[feasible].reset_index(drop=True)
+
+    executor = st.session_state.setdefault(
+        "solve_executor", ThreadPoolExecutor(max_workers=1)
+    )
+    st.session_state["solve_job"] = {
+        "future": executor.submit(
+            _build_and_solve,
+            df_hash,
+            targets,
+            solver_name,
+            time_limit,
+            gap_rel,
+            st.session_state.get("prev_solution", {}),
+            df_model,
+        ),
+        "df_model": df_model,
+        "pruned": len(df) - len(df_model),
+        "targets": targets,
+    }
 
-        st.markdown("## Optimal Solution")
-        st.dataframe(solution_df)
-
-        # -------------------------------------
-        # Meal Plan
-        # -------------------------------------
-        plan_df = build_meal_plan_table(df, solution_df)
-        plan_path = RESULTS_DIR / "solution_explanation.csv"
-        plan_df.to_csv(plan_path, index=False)
-
-        st.markdown("## Meal-wise Plan")
-        st.dataframe(plan_df)
+# ---------------------------------------------
+# RESULTS
+# Rendered from the stored job, so they survive widget interactions
+# after the solve finishes.
+# ---------------------------------------------
+_job = st.session_state.get("solve_job")
+if _job is not None and not _job["future"].done():
+    import time
+
+    st.status("Solving...", state="running")
+    time.sleep(0.3)
+    st.rerun()
+elif _job is not None:
+    from src.analysis import build_meal_plan_table, evaluate_solution
+    from src.data_visualization import (
+        plot_macro_histograms,
+        plot_calories_vs_protein,
+        plot_optimal_solution,
+    )
+    from src.solver import extract_solution
+
+    df_model = _job["df_model"]
+    targets = _job["targets"]
+
+    # -------------------------------------
+    # Pre-Optimization Plots, rendered straight from the Figure
+    # objects (no PNG write + re-read round trip).
+    # -------------------------------------
+    st.markdown("## Pre-Optimization Visualizations")
+
+    fig_hist = plot_macro_histograms(df, save=save_results)
+    if fig_hist is not None:
+        st.pyplot(fig_hist)
+
+    # Interactive calories-vs-protein scatter: Altair ships the
+    # columnar data to the browser and lets Vega-Lite render it,
+    # instead of rasterizing server-side. matplotlib remains the
+    # fallback (and stays in use for the non-Streamlit pipeline).
+    try:
+        import altair as alt
+
+        scatter = (
+            alt.Chart(df)
+            .mark_point()
+            .encode(
+                x=alt.X(field="Calories (kcal)", type="quantitative"),
+                y=alt.Y(field="Protein (g)", type="quantitative"),
+                tooltip=[
+                    alt.Tooltip(field="Food_Item"),
+                    alt.Tooltip(field="Meal_Type"),
+                ],
+            )
+            .interactive()
+        )
+        st.altair_chart(scatter, use_container_width=True)
+        if save_results:
+            plot_calories_vs_protein(df)  # keep the file output
+    except ImportError:
+        fig_scatter = plot_calories_vs_protein(df, save=save_results)
+        if fig_scatter is not None:
+            st.pyplot(fig_scatter)
+
+    # -------------------------------------
+    # Solve outcome
+    # -------------------------------------
+    st.markdown("## Optimization Model")
+    if _job["pruned"]:
+        st.caption(
+            f"Pruned {_job['pruned']} items that exceed a fat/carb cap "
+            "at their minimum serving."
+        )
 
-        # -------------------------------------
-        # Metrics
-        # -------------------------------------
-        st.markdown("## Evaluation Metrics")
-        metrics = evaluate_solution(df, solution_df, cal_target, protein_target, fat_target, carb_target)
+    model, s_vars, y_vars, items, status, solution_values = _job["future"].result()
+    st.session_state["prev_solution"] = solution_values
+    st.info("Model built successfully.")
+    st.write(f"Solver Status: **{status}**")
+
+    if status != "Optimal":
+        st.warning("The solution is not optimal. Consider relaxing constraints.")
+
+    # -------------------------------------
+    # Extract Solution
+    # -------------------------------------
+    solution_df = extract_solution(df_model, items, s_vars)
+    if save_results:
+        solution_df.to_csv(RESULTS_DIR / "optimal_solution.csv", index=False)
+
+    st.markdown("## Optimal Solution")
+    _render_solution(solution_df)
+
+    # -------------------------------------
+    # Meal Plan
+    # -------------------------------------
+    plan_df = build_meal_plan_table(df, solution_df)
+    if save_results:
+        plan_df.to_csv(RESULTS_DIR / "solution_explanation.csv", index=False)
+
+    st.markdown("## Meal-wise Plan")
+    _render_plan(plan_df)
+
+    # -------------------------------------
+    # Metrics
+    # -------------------------------------
+    st.markdown("## Evaluation Metrics")
+    metrics = evaluate_solution(
+        df,
+        solution_df,
+        targets.cal_target,
+        targets.protein_target,
+        targets.fat_target,
+        targets.carb_target,
+    )
+
+    if save_results:
+        (RESULTS_DIR / "metrics.txt").write_text(
+            "\n".join(f"{k}: {v}" for k, v in metrics.items()) + "\n"
+        )
 
-        metrics_path = RESULTS_DIR / "metrics.txt"
-        with open(metrics_path, "w") as f:
-            for k, v in metrics.items():
-                f.write(f"{k}: {v}\n")
+    st.table(pd.DataFrame.from_dict(metrics, orient="index", columns=["Value"]))
 
-        st.table(pd.DataFrame.from_dict(metrics, orient="index", columns=["Value"]))
+    # -------------------------------------
+    # Post-Optimization Plot
+    # -------------------------------------
+    if save_results:
+        plot_optimal_solution(solution_df)   # saves SVG to results/plots/
 
-        # -------------------------------------
-        # Post-Optimization Plot
-        # -------------------------------------
-        plot_optimal_solution(solution_df)   # uses your existing function
+    # Display the optimal solution bar chart (cached SVG render)
+    if not solution_df.empty:
+        svg = _solution_bar_svg(
+            tuple(zip(solution_df["Food_Item"], solution_df["Quantity (grams)"]))
+        )
+        st.image(svg, caption="Optimal Solution (grams)")
 
+    if save_results:
         st.success("All plots & results saved to /results/.")
 
-        # Display saved optimal solution bar plot
-        optimal_plot_path = PLOTS_DIR / "optimal_solution_bar.png"
-        if optimal_plot_path.exists():
-            st.image(str(optimal_plot_path), caption="Optimal Solution (grams)")
-
-
-        st.info("Check results/ and results/plots/ folders.")
+# ---------------------------------------------
+# CALORIE SWEEP
+# Independent solves across a grid of calorie targets, run in
+# parallel worker processes (one solver per core).
+# ---------------------------------------------
+if run_sweep:
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    from dataclasses import replace
+
+    from src.model import NutritionTargets
+    from src.solver import solve_for_targets
+
+    base_targets = NutritionTargets(
+        cal_target=cal_target,
+        protein_target=protein_target,
+        carb_target=carb_target,
+        fat_target=fat_target,
+        min_servings_per_item=min_serv,
+        max_servings_per_item=max_serv,
+        max_total_dishes=max_total_dishes,
+    )
+    grid = [
+        cal_target + k * sweep_step_size
+        for k in range(-int(sweep_steps), int(sweep_steps) + 1)
+    ]
+    sweep_targets = [replace(base_targets, cal_target=c) for c in grid]
+
+    st.markdown("## Calorie Sweep")
+    workers = max(1, min(len(sweep_targets), (os.cpu_count() or 2) - 1))
+    with st.spinner(f"Solving {len(sweep_targets)} targets on {workers} workers..."):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(solve_for_targets, [df] * len(sweep_targets), sweep_targets)
+            )
+
+    for target_cal, (status, sweep_solution) in zip(grid, results):
+        st.markdown(f"### Target {target_cal:.0f} kcal — {status}")
+        st.dataframe(sweep_solution)
 
 # ---------------------------------------------
 # Footer